@@ -6,12 +6,11 @@ from pathlib import Path
 
 import jupytext
 from jupytext.pandoc import subprocess
-from uv import find_uv_bin
 
-from ._nbutils import code_cell, write_ipynb
+from ._nbutils import cell_source, code_cell, write_ipynb
 from ._pep723 import includes_inline_metadata
 from ._utils import find
-from ._uv import uv
+from ._uv import find_uv_bin, uv
 
 
 def uv_pip_compile(
@@ -101,8 +100,7 @@ def add_notebook(  # noqa: PLR0913
     # need a reference so we can modify the cell["source"]
     cell = find(
         lambda cell: (
-            cell["cell_type"] == "code"
-            and includes_inline_metadata("".join(cell["source"]))
+            cell["cell_type"] == "code" and includes_inline_metadata(cell_source(cell))
         ),
         notebook["cells"],
     )
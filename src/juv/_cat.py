@@ -5,17 +5,22 @@ import sys
 from typing import TYPE_CHECKING
 
 import jupytext
+import nbformat
+
+from ._nbutils import cell_source, read_ipynb
 
 if TYPE_CHECKING:
     from pathlib import Path
 
 
+MARKDOWN_HEADER = re.compile(r"---\n.*?\n---\n", re.DOTALL)
+
+
 def strip_markdown_header(content: str) -> tuple[str, str]:
     # Match content between first set of --- markers
-    match = re.match(r"^---\n.*?\n---\n(.*)$", content, re.DOTALL)
+    match = MARKDOWN_HEADER.match(content)
     if match:
-        header = content[: content.find(match.group(1))]
-        return header, match.group(1)
+        return content[: match.end()], content[match.end() :]
     return "", content
 
 
@@ -31,20 +36,40 @@ def strip_python_frontmatter_comment(content: str) -> tuple[str, str]:
         tuple[str, str]: (frontmatter, remaining_content)
 
     """
-    lines = content.splitlines(keepends=True)
-    if not lines or lines[0].strip() != "# ---":
+    # walk line boundaries rather than splitting the whole file into lines,
+    # since the frontmatter is only a handful of lines at the top
+    end = content.find("\n")
+    if end == -1 or content[:end].strip() != "# ---":
         return "", content
 
-    for i, line in enumerate(lines[1:], 1):
+    while end != -1:
+        start = end + 1
+        end = content.find("\n", start)
+        line = content[start:] if end == -1 else content[start:end]
         if line.strip() == "# ---":
-            return "".join(lines[: i + 1]), "".join(lines[i + 1 :])
+            cut = len(content) if end == -1 else end + 1
+            return content[:cut], content[cut:]
 
     return "", content
 
 
+def read_notebook_without_outputs(path: Path) -> dict:
+    """Read a notebook for conversion to text, dropping all cell outputs.
+
+    Outputs (often large base64 images) are never part of the text
+    representation, so they are discarded before the notebook is converted
+    to an in-memory nbformat model.
+    """
+    nb = read_ipynb(path)
+    for cell in nb.get("cells", []):
+        cell.pop("outputs", None)
+        cell["source"] = cell_source(cell)
+    return nbformat.from_dict(nb)
+
+
 def notebook_contents(nb: Path | dict, *, script: bool) -> str:
     fmt = "py:percent" if script else "md"
-    notebook = nb if isinstance(nb, dict) else jupytext.read(nb)
+    notebook = nb if isinstance(nb, dict) else read_notebook_without_outputs(nb)
     contents = jupytext.writes(notebook, fmt=fmt)
     if script:
         _, contents = strip_python_frontmatter_comment(contents)
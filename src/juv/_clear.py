@@ -8,8 +8,24 @@ if TYPE_CHECKING:
     from pathlib import Path
 
 
-def clear(path: Path) -> None:
+def clear(path: Path) -> bool:
+    """Clear cell outputs and widgets metadata from a notebook.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the notebook file.
+
+    Returns
+    -------
+    bool
+        True if the notebook was modified, False if it was already cleared
+        (in which case the file is not rewritten).
+
+    """
     nb = nbformat.read(path, nbformat.NO_CONVERT)
+    if notebook_is_cleared(nb):
+        return False
     # clear cells
     for cell in nb.cells:
         if cell.cell_type == "code":
@@ -18,6 +34,16 @@ def clear(path: Path) -> None:
     # clear widgets metadata
     nb.metadata.pop("widgets", None)
     nbformat.write(nb, path)
+    return True
+
+
+def notebook_is_cleared(nb: nbformat.NotebookNode) -> bool:
+    if "widgets" in nb.metadata:
+        return False
+    for cell in filter(lambda cell: cell.cell_type == "code", nb.cells):
+        if cell.outputs or cell.execution_count is not None:
+            return False
+    return True
 
 
 def is_cleared(path: Path) -> bool:
@@ -38,10 +64,4 @@ def is_cleared(path: Path) -> bool:
         True if the notebook is cleared, False otherwise
 
     """
-    nb = nbformat.read(path, nbformat.NO_CONVERT)
-    if "widgets" in nb.metadata:
-        return False
-    for cell in filter(lambda cell: cell.cell_type == "code", nb.cells):
-        if cell.outputs or cell.execution_count is not None:
-            return False
-    return True
+    return notebook_is_cleared(nbformat.read(path, nbformat.NO_CONVERT))
@@ -5,12 +5,22 @@ from pathlib import Path
 import jupytext
 
 from ._cat import notebook_contents
+from ._nbutils import write_ipynb
+
+# VSCodium builds; VS Code itself ships as `code`, `code-insiders`, `code-oss`, ...
+VSCODIUM_EDITORS = frozenset({"codium", "vscodium"})
 
 
 class EditorAbortedError(Exception):
     """Exception raised when the editor exits abnormally."""
 
 
+def needs_wait_flag(editor: str) -> bool:
+    """Whether the editor returns immediately unless told to `--wait`."""
+    name = Path(editor).stem.lower()
+    return name.startswith("code") or name in VSCODIUM_EDITORS
+
+
 def open_editor(contents: str, suffix: str, editor: str) -> str:
     """Open an editor with the given contents and return the modified text.
 
@@ -26,26 +36,23 @@ def open_editor(contents: str, suffix: str, editor: str) -> str:
         EditorAbortedError: If editor exits abnormally
 
     """
-    with tempfile.NamedTemporaryFile(
-        suffix=suffix, mode="w+", delete=False, encoding="utf-8"
-    ) as tf:
-        if contents:
-            tf.write(contents)
-            tf.flush()
-        tpath = Path(tf.name)
-    try:
-        if any(code in editor.lower() for code in ["code", "vscode"]):
-            cmd = [editor, "--wait", tpath]
+    # a temporary directory is cleaned up in one go, and leaves the file
+    # closed (and so readable by the editor on Windows) while it is open
+    with tempfile.TemporaryDirectory() as td:
+        tpath = Path(td) / f"edit{suffix}"
+        tpath.write_bytes(contents.encode("utf-8"))
+
+        if needs_wait_flag(editor):
+            cmd = [editor, "--wait", str(tpath)]
         else:
-            cmd = [editor, tpath]
+            cmd = [editor, str(tpath)]
 
         result = subprocess.run(cmd, check=False)  # noqa: S603
         if result.returncode != 0:
             msg = f"Editor exited with code {result.returncode}"
             raise EditorAbortedError(msg)
-        return tpath.read_text(encoding="utf-8")
-    finally:
-        tpath.unlink()
+        # some (Windows) editors save UTF-8 with a byte order mark
+        return tpath.read_bytes().decode("utf-8-sig")
 
 
 def edit(path: Path, editor: str) -> None:
@@ -66,8 +73,12 @@ def edit(path: Path, editor: str) -> None:
         update["metadata"]["id"] = update["id"]
         prev_cells[update["id"]] = update
 
-    code = notebook_contents(path, script=False)
+    code = notebook_contents(prev_notebook, script=False)
     text = open_editor(code, suffix=".md", editor=editor)
+    if text == code:
+        # nothing was edited, leave the notebook (and its mtime) untouched
+        return
+
     new_notebook = jupytext.reads(text.strip(), fmt="md")
 
     # Update the previous notebook cells with the new ones
@@ -88,4 +99,4 @@ def edit(path: Path, editor: str) -> None:
         cells.append(prev)
 
     prev_notebook["cells"] = cells
-    path.write_text(jupytext.writes(prev_notebook, fmt="ipynb"))
+    write_ipynb(prev_notebook, path)
@@ -6,7 +6,9 @@ import sys
 import typing
 
 import jupytext
-from uv import find_uv_bin
+
+from ._utils import merge_with_args
+from ._uv import find_uv_bin
 
 if typing.TYPE_CHECKING:
     from pathlib import Path
@@ -27,10 +29,10 @@ def exec_(
 
     subprocess.run(  # noqa: S603
         [
-            os.fsdecode(find_uv_bin()),
+            find_uv_bin(),
             "run",
             *([f"--python={python}"] if python else []),
-            *(["--with=" + ",".join(with_args)] if with_args else []),
+            *([f"--with={merge_with_args(with_args)}"] if with_args else []),
             *(["--quiet"] if quiet else []),
             "-",
         ],
@@ -14,6 +14,7 @@ from ._uv import uv
 def new_notebook_with_inline_metadata(
     directory: Path,
     python: str | None = None,
+    packages: typing.Sequence[str] = (),
 ) -> dict:
     """Create a new notebook with inline metadata.
 
@@ -24,6 +25,9 @@ def new_notebook_with_inline_metadata(
         defer the selection of Python (if not specified) to uv.
     python : str, optional
         A version of the Python interpreter. Provided as `--python` to uv if specified.
+    packages : Sequence[str], optional
+        Packages to add to the inline metadata with `uv add` before the
+        notebook is created.
 
     Returns
     -------
@@ -43,6 +47,8 @@ def new_notebook_with_inline_metadata(
             ["init", *(["--python", python] if python else []), "--script", f.name],
             check=True,
         )
+        if len(packages) > 0:
+            uv(["add", "--script", f.name, *packages], check=True)
         contents = f.read().strip()
         return new_notebook(cells=[code_cell(contents, hidden=True), code_cell("")])
 
@@ -62,7 +68,7 @@ def get_first_non_conflicting_untitled_ipynb(directory: Path) -> Path:
 def init(
     path: Path | None,
     python: str | None,
-    packages: typing.Sequence[str] = [],
+    packages: typing.Sequence[str] = (),
 ) -> Path:
     """Initialize a new notebook.
 
@@ -88,12 +94,6 @@ def init(
         rich.print("File must have a `[cyan].ipynb[/cyan]` extension.", file=sys.stderr)
         sys.exit(1)
 
-    notebook = new_notebook_with_inline_metadata(path.parent, python)
+    notebook = new_notebook_with_inline_metadata(path.parent, python, packages)
     write_ipynb(notebook, path)
-
-    if len(packages) > 0:
-        from ._add import add
-
-        add(path=path, packages=packages)
-
     return path
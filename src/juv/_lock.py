@@ -1,31 +1,32 @@
 import tempfile
 from pathlib import Path
 
-import jupytext
-
-from ._nbutils import code_cell, write_ipynb
-from ._pep723 import includes_inline_metadata
+from ._nbutils import cell_source, code_cell, read_ipynb, write_ipynb
+from ._pep723 import includes_inline_metadata, may_include_inline_metadata
 from ._utils import find
 from ._uv import uv
 
 
 def lock(*, path: Path, clear: bool) -> None:
-    notebook = jupytext.read(path, fmt="ipynb")
+    notebook = read_ipynb(path)
 
     if clear:
-        notebook.get("metadata", {}).pop("uv.lock", None)
-        write_ipynb(notebook, path)
+        if notebook.get("metadata", {}).pop("uv.lock", None) is not None:
+            write_ipynb(notebook, path)
         return
 
     cell = find(
         lambda cell: (
             cell["cell_type"] == "code"
-            and includes_inline_metadata("".join(cell["source"]))
+            # check for the marker before joining (raw JSON) line lists
+            and may_include_inline_metadata(cell["source"])
+            and includes_inline_metadata(cell_source(cell))
         ),
         notebook["cells"],
     )
 
-    if cell is None:
+    inserted_cell = cell is None
+    if inserted_cell:
         notebook["cells"].insert(0, code_cell("", hidden=True))
         cell = notebook["cells"][0]
 
@@ -36,15 +37,18 @@ def lock(*, path: Path, clear: bool) -> None:
         dir=path.parent,
         encoding="utf-8",
     ) as temp_file:
-        temp_file.write(cell["source"].strip())
+        temp_file.write(cell_source(cell).strip())
         temp_file.flush()
 
         uv(["lock", "--script", temp_file.name], check=True)
 
         lock_file = Path(f"{temp_file.name}.lock")
-
-        notebook["metadata"]["uv.lock"] = lock_file.read_text(encoding="utf-8")
-
+        lock_contents = lock_file.read_text(encoding="utf-8")
         lock_file.unlink(missing_ok=True)
 
+    if not inserted_cell and notebook["metadata"].get("uv.lock") == lock_contents:
+        # the lock is unchanged, so don't rewrite the (possibly large) notebook
+        return
+
+    notebook["metadata"]["uv.lock"] = lock_contents
     write_ipynb(notebook, path.with_suffix(".ipynb"))
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import copy
+import json
 from typing import TYPE_CHECKING
 
-import jupytext
+import nbformat
 import nbformat.v4.nbbase as nb
+from nbformat.notebooknode import from_dict
+from nbformat.v4.nbjson import writes as writes_json
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -17,6 +21,16 @@ def code_cell(source: str, *, hidden: bool = False) -> dict:
     return nb.new_code_cell(source, **kwargs)
 
 
+def cell_source(cell: dict) -> str:
+    """Get the source of a cell as a single string.
+
+    nbformat joins multi-line sources into a string when reading, while the
+    on-disk (and raw JSON) representation is a list of lines.
+    """
+    source = cell["source"]
+    return source if isinstance(source, str) else "".join(source)
+
+
 def new_notebook(cells: list[dict]) -> dict:
     notebook = nb.new_notebook(cells=cells)
     if "kernelspec" not in notebook.metadata:
@@ -28,5 +42,29 @@ def new_notebook(cells: list[dict]) -> dict:
     return notebook
 
 
+def read_ipynb(file: Path) -> dict:
+    """Read a notebook as plain JSON, upgrading it to nbformat 4 if needed.
+
+    Unlike `jupytext.read`, this skips building and validating an nbformat
+    model of every cell, for commands that only touch a cell or two.
+    """
+    nb = json.loads(file.read_bytes())
+    if nb.get("nbformat", 4) < 4:  # noqa: PLR2004
+        nb = nbformat.convert(from_dict(nb), 4)
+    return nb
+
+
 def write_ipynb(nb: dict, file: Path) -> None:
-    file.write_text(jupytext.writes(nb, fmt="ipynb"))
+    # Same output as `jupytext.writes(nb, fmt="ipynb")`, but skips jupytext's
+    # format resolution and nbformat's schema validation of every cell.
+    from jupytext.formats import rearrange_jupytext_metadata
+
+    # upgrades legacy jupytext keys in place, so work on a copy
+    metadata = copy.deepcopy(nb.get("metadata", {}))
+    rearrange_jupytext_metadata(metadata)
+    jupytext_metadata = metadata.get("jupytext", {})
+    jupytext_metadata.pop("text_representation", None)
+    if not jupytext_metadata:
+        metadata.pop("jupytext", None)
+    contents = writes_json(from_dict({**nb, "metadata": metadata}))
+    file.write_text(contents, encoding="utf-8")
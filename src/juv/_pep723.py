@@ -1,25 +1,42 @@
 from __future__ import annotations
 
+import functools
 import re
 
-REGEX = r"(?m)^# /// (?P<type>[a-zA-Z0-9-]+)$\s(?P<content>(^#(| .*)$\s)+)^# ///$"
+REGEX = re.compile(
+    r"(?m)^# /// (?P<type>[a-zA-Z0-9-]+)$\s(?P<content>(^#(| .*)$\s)+)^# ///$"
+)
 
 
+@functools.lru_cache(maxsize=128)
+def search_inline_meta(script: str) -> re.Match[str] | None:
+    """Find the first PEP 723 metadata block in a script.
+
+    Cached on the script contents, since callers typically check for a block
+    and then extract it from the same cell source.
+    """
+    if "# ///" not in script:
+        return None
+    return REGEX.search(script)
+
+
+@functools.lru_cache(maxsize=128)
 def parse_inline_script_metadata(script: str) -> str | None:
     """Parse PEP 723 metadata from an inline script."""
+    if "# ///" not in script:
+        return None
     name = "script"
-    matches = list(
-        filter(lambda m: m.group("type") == name, re.finditer(REGEX, script)),
-    )
-    if len(matches) > 1:
+    matches = (m for m in REGEX.finditer(script) if m.group("type") == name)
+    match = next(matches, None)
+    if match is None:
+        return None
+    if next(matches, None) is not None:
         msg = f"Multiple {name} blocks found"
         raise ValueError(msg)
-    if len(matches) == 1:
-        return "".join(
-            line[2:] if line.startswith("# ") else line[1:]
-            for line in matches[0].group("content").splitlines(keepends=True)
-        )
-    return None
+    return "".join(
+        line[2:] if line.startswith("# ") else line[1:]
+        for line in match.group("content").splitlines(keepends=True)
+    )
 
 
 def extract_inline_meta(script: str) -> tuple[str | None, str]:
@@ -36,11 +53,18 @@ def extract_inline_meta(script: str) -> tuple[str | None, str]:
         The extracted metadata block and the script with the metadata block removed
 
     """
-    if match := re.search(REGEX, script):
-        meta_comment = match.group(0)
-        return meta_comment, script.replace(meta_comment, "").strip()
+    if match := search_inline_meta(script):
+        start, end = match.span()
+        return match.group(0), (script[:start] + script[end:]).strip()
     return None, script
 
 
 def includes_inline_metadata(script: str) -> bool:
-    return re.search(REGEX, script) is not None
+    return search_inline_meta(script) is not None
+
+
+def may_include_inline_metadata(source: str | list[str]) -> bool:
+    """Check a cell source for the `# ///` marker without joining its lines."""
+    if isinstance(source, str):
+        return "# ///" in source
+    return any("# ///" in line for line in source)
@@ -3,11 +3,10 @@ from __future__ import annotations
 import os
 import typing
 
-import jupytext
 import rich
 
-from ._nbutils import code_cell, write_ipynb
-from ._pep723 import extract_inline_meta
+from ._nbutils import cell_source, code_cell, read_ipynb, write_ipynb
+from ._pep723 import extract_inline_meta, may_include_inline_metadata
 from ._run_template import Runtime, prepare_run_script_and_uv_run_args
 
 if typing.TYPE_CHECKING:
@@ -15,6 +14,10 @@ if typing.TYPE_CHECKING:
 
 
 def load_script_notebook(fp: Path) -> dict:
+    # only scripts need jupytext, so keep it off the import path of
+    # `juv run notebook.ipynb`
+    import jupytext
+
     script = fp.read_text(encoding="utf-8")
     # we could read the whole thing with jupytext,
     # but is nice to ensure the script meta is at the top in it's own
@@ -31,13 +34,18 @@ def to_notebook(fp: Path) -> tuple[str | None, dict]:
     if fp.suffix == ".py":
         nb = load_script_notebook(fp)
     elif fp.suffix == ".ipynb":
-        nb = jupytext.read(fp, fmt="ipynb")
+        # only cell sources and notebook metadata are read from here on, so
+        # skip jupytext/nbformat's validation of every cell
+        nb = read_ipynb(fp)
     else:
         msg = f"Unsupported file extension: {fp.suffix}"
         raise ValueError(msg)
 
     for cell in filter(lambda c: c["cell_type"] == "code", nb.get("cells", [])):
-        meta, _ = extract_inline_meta("".join(cell["source"]))
+        # check for the marker before joining (raw JSON) line lists
+        if not may_include_inline_metadata(cell["source"]):
+            continue
+        meta, _ = extract_inline_meta(cell_source(cell))
         if meta:
             return meta, nb
 
@@ -11,97 +11,119 @@ import os
 import re
 import signal
 import subprocess
+import sys
 import tempfile
 import time
+import typing
+from contextlib import suppress
 from pathlib import Path
-from queue import Queue
-from threading import Thread
 
 from rich.console import Console
-from uv import find_uv_bin
 
+from ._uv import find_uv_bin
 from ._version import __version__
 
+URL = re.compile(r"http://[^\s]+")
+PORT = re.compile(r":\d+")
+DRAIN_CHUNK_SIZE = 64 * 1024
 
-def extract_url(log_line: str) -> str:
-    match = re.search(r"http://[^\s]+", log_line)
-    return "" if not match else match.group(0)
+# URL path to open a notebook, by Jupyter frontend
+NOTEBOOK_PATHS = {
+    "jupyterlab": "/tree/{}",
+    "notebook": "/notebooks/{}",
+    "nbclassic": "/notebooks/{}",
+}
 
 
 def format_url(url: str, path: str) -> str:
-    if "?" in url:
-        url, query = url.split("?", 1)
-        url = url.removesuffix("/tree")
-        return format_url(url, path) + f"[dim]?{query}[/dim]"
+    url, _, query = url.partition("?")
     url = url.removesuffix("/tree")
-    return f"[cyan]{re.sub(r':\d+', r'[b]\g<0>[/b]', url)}{path}[/cyan]"
+    query = f"[dim]?{query}[/dim]" if query else ""
+    url = PORT.sub(r"[b]\g<0>[/b]", url)
+    return f"[cyan]{url}{path}[/cyan]{query}"
 
 
 def process_output(
     console: Console,
     filename: str,
-    output_queue: Queue,
+    lines: typing.Iterator[bytes],
 ) -> None:
-    status = console.status("Running uv...", spinner="dots")
-    status.start()
     start = time.time()
 
-    name_version: None | tuple[str, str] = None
+    with console.status("Running uv...", spinner="dots") as status:
+        name_version: None | tuple[str, str] = None
 
-    while name_version is None:
-        line = output_queue.get()
-        if line.startswith("Reading inline script"):
-            continue
+        for raw in lines:
+            line = raw.decode("utf-8", errors="replace")
+            if line.startswith("Reading inline script"):
+                continue
+
+            if line.startswith("JUV_MANGED="):
+                name_version = line[len("JUV_MANGED=") :].split(",")
+                break
 
-        if line.startswith("JUV_MANGED="):
-            name_version = line[len("JUV_MANGED=") :].split(",")
-        else:
             console.print(line)
 
-    jupyter, version = name_version
+        if name_version is None:
+            # uv exited before starting Jupyter
+            return
 
-    path = {
-        "jupyterlab": f"/tree/{filename}",
-        "notebook": f"/notebooks/{filename}",
-        "nbclassic": f"/notebooks/{filename}",
-    }[jupyter]
+        jupyter, version = name_version
 
-    def display(url: str) -> None:
-        end = time.time()
-        elapsed_ms = (end - start) * 1000
+        path = NOTEBOOK_PATHS[jupyter].format(filename)
 
-        time_str = (
-            f"[b]{elapsed_ms:.0f}[/b] ms"
-            if elapsed_ms < 1000  # noqa: PLR2004
-            else f"[b]{elapsed_ms / 1000:.1f}[/b] s"
-        )
+        url = None
+        server_started = False
+
+        # Jupyter's logs are only scanned for the server URL, so only decode
+        # the lines that may contain one
+        for line in lines:
+            if line.startswith(b"[") and not server_started:
+                status.update("Jupyter server started", spinner="dots")
+                server_started = True
+
+            if b"http://" not in line:
+                continue
+
+            match = URL.search(line.decode("utf-8", errors="replace"))
+            if match:
+                url = format_url(match.group(0), path)
+                break
+
+    if url is None:
+        return
+
+    end = time.time()
+    elapsed_ms = (end - start) * 1000
 
-        console.print(
-            f"""
+    time_str = (
+        f"[b]{elapsed_ms:.0f}[/b] ms"
+        if elapsed_ms < 1000  # noqa: PLR2004
+        else f"[b]{elapsed_ms / 1000:.1f}[/b] s"
+    )
+
+    console.print(
+        f"""
   [green][b]juv[/b] v{__version__}[/green] [dim]ready in[/dim] [white]{time_str}[/white]
 
   [green b]➜[/green b]  [b]Local:[/b]    {url}
   [dim][green b]➜[/green b]  [b]Jupyter:[/b]  {jupyter} v{version}[/dim]
   """,
-            highlight=False,
-            no_wrap=True,
-        )
-
-    url = None
-    server_started = False
-
-    while url is None:
-        line = output_queue.get()
+        highlight=False,
+        no_wrap=True,
+    )
 
-        if line.startswith("[") and not server_started:
-            status.update("Jupyter server started", spinner="dots")
-            server_started = True
 
-        if "http://" in line:
-            url = format_url(extract_url(line), path)
-
-    status.stop()
-    display(url)
+def stop_server(process: subprocess.Popen, *, force: bool) -> None:
+    """Ask the server to shut down, or kill it if it ignored an earlier request."""
+    if sys.platform == "win32":
+        if force:
+            process.kill()
+        else:
+            process.terminate()
+        return
+    # the server leads its own session, so its pid is the process group id
+    os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
 
 
 def run(
@@ -112,7 +134,6 @@ def run(
     dir: Path,  # noqa: A002
 ) -> None:
     console = Console()
-    output_queue = Queue()
 
     with tempfile.NamedTemporaryFile(
         mode="w+",
@@ -131,30 +152,52 @@ def run(
             env["JUV_LOCKFILE_PATH"] = str(lockfile)
 
         process = subprocess.Popen(  # noqa: S603
-            [os.fsdecode(find_uv_bin()), *args, f.name],
+            [find_uv_bin(), *args, f.name],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            preexec_fn=os.setsid,  # noqa: PLW1509
-            text=True,
+            start_new_session=True,
             env=env,
         )
 
-        output_thread = Thread(
-            target=process_output,
-            args=(console, filename, output_queue),
-        )
-        output_thread.start()
+        # a single reader, so lines are consumed directly rather than handed
+        # from a reader thread to the display through a queue
+        lines = iter(process.stdout.readline, b"")
+
+        interrupts = 0
+        reported = 0
+
+        def shutdown(_signum: int, _frame: object) -> None:
+            # forward Ctrl+C to the server as soon as it arrives; reading the
+            # pipe below then ends at EOF once the server exits. Messages are
+            # printed by the main loop, since printing from a signal handler
+            # could re-enter the console mid-write.
+            nonlocal interrupts
+            interrupts += 1
+            with suppress(ProcessLookupError):
+                stop_server(process, force=interrupts > 1)
+
+        def report_interrupts() -> None:
+            nonlocal reported
+            while reported < interrupts:
+                reported += 1
+                console.print(
+                    "[dim]Shutting down...[/dim]"
+                    if reported == 1
+                    else "[dim]Killing Jupyter...[/dim]"
+                )
+
+        previous_handler = signal.signal(signal.SIGINT, shutdown)
 
         try:
-            while True and process.stdout:
-                line = process.stdout.readline()
-                if not line and process.poll() is not None:
-                    break
-                output_queue.put(line)
-        except KeyboardInterrupt:
-            with console.status("Shutting down..."):
-                os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+            process_output(console, filename, lines)
+            report_interrupts()
+            # nothing is shown after the banner, but keep draining the pipe (in
+            # large chunks) so the server never blocks writing logs. Closing it
+            # instead would break the server's logging.
+            while process.stdout.read1(DRAIN_CHUNK_SIZE):
+                report_interrupts()
+            process.wait()
+            report_interrupts()
         finally:
+            signal.signal(signal.SIGINT, previous_handler)
             lockfile.unlink(missing_ok=True)
-            output_queue.put(None)
-            output_thread.join()
@@ -7,7 +7,7 @@ import sys
 import tempfile
 from pathlib import Path
 
-from uv import find_uv_bin
+from ._uv import find_uv_bin
 
 IS_WINDOWS = sys.platform.startswith("win")
 
@@ -35,15 +35,15 @@ def run(script: str, args: list[str], lockfile_contents: str | None, dir: Path)
 
         if not IS_WINDOWS:
             process = subprocess.Popen(  # noqa: S603
-                [os.fsdecode(find_uv_bin()), *args, f.name],
+                [find_uv_bin(), *args, f.name],
                 stdout=sys.stdout,
                 stderr=sys.stderr,
-                preexec_fn=os.setsid,  # noqa: PLW1509
+                start_new_session=True,
                 env=env,
             )
         else:
             process = subprocess.Popen(  # noqa: S603
-                [os.fsdecode(find_uv_bin()), *args, f.name],
+                [find_uv_bin(), *args, f.name],
                 stdout=sys.stdout,
                 stderr=sys.stderr,
                 creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
@@ -54,7 +54,8 @@ def run(script: str, args: list[str], lockfile_contents: str | None, dir: Path)
             process.wait()
         except KeyboardInterrupt:
             if not IS_WINDOWS:
-                os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+                # the child leads its own session, so its pid is the group id
+                os.killpg(process.pid, signal.SIGTERM)
             else:
                 os.kill(process.pid, signal.SIGTERM)
         finally:
@@ -3,14 +3,17 @@ from __future__ import annotations
 import typing
 from dataclasses import dataclass
 
+from ._utils import merge_with_args
+
 if typing.TYPE_CHECKING:
     import pathlib
 
 RuntimeName = typing.Literal["notebook", "lab", "nbclassic"]
+RUNTIME_NAMES = frozenset(typing.get_args(RuntimeName))
 
 
 def is_notebook_kind(kind: str) -> typing.TypeGuard[RuntimeName]:
-    return kind in {"notebook", "lab", "nbclassic"}
+    return kind in RUNTIME_NAMES
 
 
 @dataclass
@@ -20,18 +23,12 @@ class Runtime:
 
     @classmethod
     def try_from_specifier(cls, value: str) -> Runtime:
-        if "@" in value:
-            parts = value.split("@")
-        elif "==" in value:
-            parts = value.split("==")
-        else:
-            parts = [value]
-
-        if len(parts) == 2 and is_notebook_kind(parts[0]):  # noqa: PLR2004
-            return Runtime(parts[0], parts[1])
+        name, sep, version = value.partition("@")
+        if not sep:
+            name, sep, version = value.partition("==")
 
-        if len(parts) == 1 and is_notebook_kind(parts[0]):
-            return Runtime(parts[0])
+        if is_notebook_kind(name) and not (sep and sep in version):
+            return Runtime(name, version) if sep else Runtime(name)
 
         msg = f"Invalid runtime specifier: {value}"
         raise ValueError(msg)
@@ -76,11 +73,16 @@ def update_uv_lock(notebook_path: str):
     with open(lockfile_path, "r", encoding="utf-8") as lockfile:
         lock_contents = lockfile.read()
 
-    with open(notebook_path, "r", encoding="utf-8") as f:
-        nb = json.load(f)
+    with open(notebook_path, "rb") as f:
+        nb = json.loads(f.read())
+
+    metadata = nb.setdefault("metadata", {{}})
+    if metadata.get("uv.lock") == lock_contents:
+        # the lock is unchanged, so leave the notebook file untouched
+        return
 
     # Replace contents and rewrite notebook file before opening
-    nb.setdefault("metadata", {{}})["uv.lock"] = lock_contents
+    metadata["uv.lock"] = lock_contents
     with open(notebook_path, "w", encoding="utf-8") as f:
         json.dump(nb, f, ensure_ascii=False, indent=1)
         f.write("\\n")
@@ -105,6 +107,7 @@ delete_run_script_and_lockfile()
 
 SETUP_JUPYTER_DATA_DIR = """
 import tempfile
+import shutil
 import signal
 from pathlib import Path
 import os
@@ -125,7 +128,7 @@ class TemporaryDirectoryIgnoreErrors(tempfile.TemporaryDirectory):
             pass  # Ignore cleanup errors
 
 temp_dir = TemporaryDirectoryIgnoreErrors(dir=juv_data_dir)
-merged_dir = Path(temp_dir.name)
+merged_dir = temp_dir.name
 
 def handle_termination(signum, frame):
     temp_dir.cleanup()
@@ -135,32 +138,57 @@ signal.signal(signal.SIGTERM, handle_termination)
 signal.signal(signal.SIGINT, handle_termination)
 
 config_paths = []
-root_data_dir = Path(sys.prefix) / "share" / "jupyter"
+root_data_dir = os.path.join(sys.prefix, "share", "jupyter")
 jupyter_paths = [root_data_dir]
-for path in map(Path, sys.path):
-    if not path.name == "site-packages":
+seen_venvs = set()
+for path in sys.path:
+    if os.path.basename(path) != "site-packages":
+        continue
+    venv_path = os.path.dirname(os.path.dirname(os.path.dirname(path)))
+    if venv_path in seen_venvs:
         continue
-    venv_path = path.parent.parent.parent
-    config_paths.append(venv_path / "etc" / "jupyter")
-    data_dir = venv_path / "share" / "jupyter"
-    if not data_dir.exists() or str(data_dir) == str(root_data_dir):
+    seen_venvs.add(venv_path)
+    config_paths.append(os.path.join(venv_path, "etc", "jupyter"))
+    data_dir = os.path.join(venv_path, "share", "jupyter")
+    if data_dir == root_data_dir or not os.path.isdir(data_dir):
         continue
 
     jupyter_paths.append(data_dir)
 
 
-for path in reversed(jupyter_paths):
-    for item in path.rglob('*'):
-        if item.is_file():
-            dest = merged_dir / item.relative_to(path)
-            dest.parent.mkdir(parents=True, exist_ok=True)
+def link_tree(src, dest):
+    # hard link every file under `src` into `dest`. scandir entries know their
+    # file type from the directory listing, so (unlike rglob + is_file) this
+    # doesn't stat every path, and each directory is created only once.
+    try:
+        with os.scandir(src) as it:
+            entries = list(it)
+    except OSError:
+        return
+    made_dest = False
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            link_tree(entry.path, os.path.join(dest, entry.name))
+        elif entry.is_file():
+            if not made_dest:
+                os.makedirs(dest, exist_ok=True)
+                made_dest = True
+            target = os.path.join(dest, entry.name)
             try:
-                os.link(item, dest)
+                os.link(entry.path, target)
             except FileExistsError:
                 pass
+            except OSError:
+                # hard links can't cross filesystems (or aren't supported)
+                if not os.path.exists(target):
+                    shutil.copyfile(entry.path, target)
+
+
+for path in reversed(jupyter_paths):
+    link_tree(path, merged_dir)
 
-os.environ["JUPYTER_DATA_DIR"] = str(merged_dir)
-os.environ["JUPYTER_CONFIG_PATH"] = os.pathsep.join(map(str, config_paths))
+os.environ["JUPYTER_DATA_DIR"] = merged_dir
+os.environ["JUPYTER_CONFIG_PATH"] = os.pathsep.join(config_paths)
 """
 
 LAB = """
@@ -273,7 +301,7 @@ def prepare_run_script_and_uv_run_args(  # noqa: PLR0913
         *(["--no-project"] if no_project else []),
         *([f"--python={python}"] if python else []),
         f"--with={runtime.as_with_arg()}",
-        *(["--with=" + ",".join(with_args)] if with_args else []),
+        *([f"--with={merge_with_args(with_args)}"] if with_args else []),
         "--script",
     ]
     return script, args
@@ -6,15 +6,15 @@ import typing
 from contextlib import suppress
 from dataclasses import dataclass
 
-import jupytext
 import tomlkit
 from whenever import Date, OffsetDateTime, SystemDateTime, ZonedDateTime
 
-from ._nbutils import write_ipynb
+from ._nbutils import cell_source, read_ipynb, write_ipynb
 from ._pep723 import (
-    extract_inline_meta,
     includes_inline_metadata,
+    may_include_inline_metadata,
     parse_inline_script_metadata,
+    search_inline_meta,
 )
 
 if typing.TYPE_CHECKING:
@@ -83,13 +83,13 @@ def get_git_timestamp(rev: str) -> OffsetDateTime:
 def update_inline_metadata(
     script: str, dt: OffsetDateTime | None
 ) -> tuple[str, Action]:
-    meta_comment, _ = extract_inline_meta(script)
+    match = search_inline_meta(script)
 
-    if meta_comment is None:
+    if match is None:
         msg = "No PEP 723 metadata block found."
         raise ValueError(msg)
 
-    toml = parse_inline_script_metadata(meta_comment)
+    toml = parse_inline_script_metadata(match.group(0))
 
     if toml is None:
         msg = "No TOML metadata found in the PEP 723 metadata block."
@@ -121,17 +121,14 @@ def update_inline_metadata(
         )
 
     new_toml = tomlkit.dumps(meta).strip()
-    new_meta_comment = "\n".join(
-        [
-            "# /// script",
-            *[f"# {line}" if line else "#" for line in new_toml.splitlines()],
-            "# ///",
-        ]
-    )
-    return script.replace(meta_comment, new_meta_comment), action
+    body = "".join(f"# {line}\n" if line else "#\n" for line in new_toml.splitlines())
+    new_meta_comment = f"# /// script\n{body}# ///"
+    # splice in the new block at the match, rather than searching for it again
+    start, end = match.span()
+    return script[:start] + new_meta_comment + script[end:], action
 
 
-def stamp(  # noqa: PLR0913
+def stamp(  # noqa: C901, PLR0913
     path: Path,
     *,
     timestamp: str | None,
@@ -158,13 +155,17 @@ def stamp(  # noqa: PLR0913
         dt = SystemDateTime.now().to_fixed_offset()
 
     if path.suffix == ".ipynb":
-        nb = jupytext.read(path)
-
-        for cell in filter(lambda c: c.cell_type == "code", nb.cells):
-            source = "".join(cell.source)
+        nb = read_ipynb(path)
+
+        for cell in nb["cells"]:
+            if cell["cell_type"] != "code" or not may_include_inline_metadata(
+                cell["source"]
+            ):
+                continue
+            source = cell_source(cell)
             if includes_inline_metadata(source):
                 source, action = update_inline_metadata(source, dt)
-                cell.source = source.splitlines(keepends=True)
+                cell["source"] = source.splitlines(keepends=True)
                 break
 
         if action is None:
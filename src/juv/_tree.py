@@ -4,7 +4,7 @@ from pathlib import Path
 
 import jupytext
 
-from ._nbutils import code_cell, write_ipynb
+from ._nbutils import cell_source, code_cell, write_ipynb
 from ._pep723 import includes_inline_metadata
 from ._utils import find
 from ._uv import uv
@@ -19,8 +19,7 @@ def tree(
     # need a reference so we can modify the cell["source"]
     cell = find(
         lambda cell: (
-            cell["cell_type"] == "code"
-            and includes_inline_metadata("".join(cell["source"]))
+            cell["cell_type"] == "code" and includes_inline_metadata(cell_source(cell))
         ),
         notebook["cells"],
     )
@@ -22,3 +22,24 @@ def find(cb: typing.Callable[[T], bool], items: list[T]) -> T | None:
 
     """
     return next((item for item in items if cb(item)), None)
+
+
+def merge_with_args(with_args: typing.Sequence[str]) -> str:
+    """Deduplicate `--with` values, keeping their original order.
+
+    Values are kept whole, since a single requirement may itself contain
+    commas (e.g., `pandas>=2,<3` or `foo[a,b]`); only exact duplicates
+    are dropped.
+
+    Parameters
+    ----------
+    with_args : Sequence[str]
+        The values passed to `--with`.
+
+    Returns
+    -------
+    str
+        The unique values joined with commas.
+
+    """
+    return ",".join(dict.fromkeys(with_args))
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import functools
 import os
 import subprocess
 
-from uv import find_uv_bin
+from uv import find_uv_bin as _find_uv_bin
+
+
+@functools.lru_cache(maxsize=None)
+def find_uv_bin() -> str:
+    """Locate the uv executable, resolving it at most once per process."""
+    return os.fsdecode(_find_uv_bin())
 
 
 def uv(args: list[str], *, check: bool) -> subprocess.CompletedProcess:
@@ -23,5 +30,6 @@ def uv(args: list[str], *, check: bool) -> subprocess.CompletedProcess:
         The result of the subprocess.
 
     """
-    uv = os.fsdecode(find_uv_bin())
-    return subprocess.run([uv, *args], capture_output=True, check=check, env=os.environ)  # noqa: S603
+    return subprocess.run(  # noqa: S603
+        [find_uv_bin(), *args], capture_output=True, check=check, env=os.environ
+    )
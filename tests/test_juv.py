@@ -1,51 +1,46 @@
 from __future__ import annotations
 
-import contextlib
+import json
 import os
-import pathlib
 import re
+import shutil
 import sys
+import typing
 
 import jupytext
 import pytest
 from click.testing import CliRunner, Result
 from inline_snapshot import snapshot
-from jupytext.pandoc import tempfile
-from nbformat.v4.nbbase import new_code_cell, new_notebook
+from nbformat import v3
+from nbformat.v4.nbbase import new_code_cell, new_markdown_cell, new_notebook
 
 from juv import cli
+from juv._edit import needs_wait_flag
 from juv._nbutils import write_ipynb
 from juv._pep723 import parse_inline_script_metadata
 from juv._run import to_notebook
 from juv._uv import uv
 
-SELF_DIR = pathlib.Path(__file__).parent
+if typing.TYPE_CHECKING:
+    import pathlib
 
-
-# Custom TemporaryDirectory for Python < 3.10
-# TODO: Use `ignore_cleanup_errors=True` in Python 3.10+  # noqa: TD002, TD003
-class TemporaryDirectoryIgnoreErrors(tempfile.TemporaryDirectory):
-    def cleanup(self) -> None:
-        with contextlib.suppress(Exception):
-            super().cleanup()
+# CliRunner applies `env` on top of os.environ for the duration of a call
+RUNNER = CliRunner()
+INVOKE_ENV = {
+    "JUV_RUN_MODE": "dry",
+    "JUV_JUPYTER": "lab",
+    "JUV_TZ": "America/New_York",
+    "UV_EXCLUDE_NEWER": "2023-02-01T00:00:00-02:00",
+}
 
 
 def invoke(args: list[str], uv_python: str = "3.13") -> Result:
-    return CliRunner().invoke(
-        cli,
-        args,
-        env={
-            **os.environ,
-            "UV_PYTHON": uv_python,
-            "JUV_RUN_MODE": "dry",
-            "JUV_JUPYTER": "lab",
-            "JUV_TZ": "America/New_York",
-            "UV_EXCLUDE_NEWER": "2023-02-01T00:00:00-02:00",
-        },
+    return RUNNER.invoke(
+        cli, args, catch_exceptions=False, env={**INVOKE_ENV, "UV_PYTHON": uv_python}
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_script() -> str:
     return """
 # /// script
@@ -73,8 +68,11 @@ def test_parse_pep723_meta_no_meta() -> None:
     assert parse_inline_script_metadata(script_without_meta) is None
 
 
+ID_PATTERN = re.compile(r'"id": "[a-zA-Z0-9-]+"')
+
+
 def filter_ids(output: str) -> str:
-    return re.sub(r'"id": "[a-zA-Z0-9-]+"', '"id": "<ID>"', output)
+    return ID_PATTERN.sub('"id": "<ID>"', output)
 
 
 def test_to_notebook_script(tmp_path: pathlib.Path) -> None:
@@ -175,88 +173,98 @@ Error: Invalid value for 'FILE': Path 'test.ipynb' does not exist.
 """)
 
 
-def test_run_basic(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.chdir(tmp_path)
-    invoke(["init", "test.ipynb"])
-    result = invoke(["run", "test.ipynb"])
-    assert result.exit_code == 0
-    assert result.stdout == snapshot("uv run --no-project --with=jupyterlab --script\n")
-
-
-def test_run_python_override(
-    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
-) -> None:
-    monkeypatch.chdir(tmp_path)
-    invoke(["init", "test.ipynb"])
-
-    result = invoke(["run", "--python=3.12", "test.ipynb"])
-    assert result.exit_code == 0
-    assert result.stdout == snapshot(
-        "uv run --no-project --python=3.12 --with=jupyterlab --script\n"
-    )
-
-
-def test_run_with_script_meta(
-    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
-) -> None:
-    monkeypatch.chdir(tmp_path)
-    invoke(["init", "test.ipynb", "--with", "numpy"])
-    result = invoke(["run", "test.ipynb"])
-    assert result.exit_code == 0
-    assert result.stdout == snapshot("uv run --no-project --with=jupyterlab --script\n")
+@pytest.fixture(scope="session")
+def init_notebook_bytes(tmp_path_factory: pytest.TempPathFactory) -> bytes:
+    """The notebook `juv init test.ipynb` creates, generated once for the session."""
+    path = tmp_path_factory.mktemp("init") / "test.ipynb"
+    invoke(["init", str(path)])
+    return path.read_bytes()
 
 
-def test_run_with_script_meta_and_with_args(
-    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
-) -> None:
-    monkeypatch.chdir(tmp_path)
-    invoke(["init", "test.ipynb", "--with", "numpy"])
-    result = invoke(["run", "--with", "polars", "--with=anywidget,foo", "test.ipynb"])
-    assert result.exit_code == 0
-    assert result.stdout == snapshot(
-        "uv run --no-project --with=jupyterlab --with=polars,anywidget,foo --script\n"
-    )
-
-
-def test_run_nbclassic(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.chdir(tmp_path)
-    invoke(["init", "--with", "numpy", "test.ipynb"])
-    result = invoke(["run", "--with=polars", "--jupyter=nbclassic", "test.ipynb"])
-    assert result.exit_code == 0
-    assert result.stdout == snapshot(
-        "uv run --no-project --with=nbclassic --with=polars --script\n"
-    )
-
-
-def test_run_notebook_and_version(
-    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+@pytest.mark.parametrize(
+    ("init_args", "run_args", "expected"),
+    [
+        pytest.param(
+            [],
+            ["test.ipynb"],
+            snapshot("uv run --no-project --with=jupyterlab --script\n"),
+            id="basic",
+        ),
+        pytest.param(
+            [],
+            ["--python=3.12", "test.ipynb"],
+            snapshot("uv run --no-project --python=3.12 --with=jupyterlab --script\n"),
+            id="python_override",
+        ),
+        pytest.param(
+            ["--with", "numpy"],
+            ["test.ipynb"],
+            snapshot("uv run --no-project --with=jupyterlab --script\n"),
+            id="with_script_meta",
+        ),
+        pytest.param(
+            ["--with", "numpy"],
+            ["--with", "polars", "--with=anywidget,foo", "test.ipynb"],
+            snapshot(
+                "uv run --no-project --with=jupyterlab --with=polars,anywidget,foo --script\n"
+            ),
+            id="with_script_meta_and_with_args",
+        ),
+        pytest.param(
+            [],
+            [
+                "--with",
+                "pandas>=2,<3",
+                "--with",
+                "foo[a,b]",
+                "--with",
+                "pandas>=2,<3",
+                "test.ipynb",
+            ],
+            snapshot(
+                "uv run --no-project --with=jupyterlab --with=pandas>=2,<3,foo[a,b] --script\n"
+            ),
+            id="with_args_containing_commas",
+        ),
+        pytest.param(
+            ["--with", "numpy"],
+            ["--with=polars", "--jupyter=nbclassic", "test.ipynb"],
+            snapshot("uv run --no-project --with=nbclassic --with=polars --script\n"),
+            id="nbclassic",
+        ),
+        pytest.param(
+            ["--python=3.8"],
+            ["--jupyter=notebook@6.4.0", "test.ipynb"],
+            snapshot(
+                "uv run --no-project --with=notebook==6.4.0,setuptools --script\n"
+            ),
+            id="notebook_and_version",
+        ),
+        pytest.param(
+            [],
+            ["test.ipynb", "--", "--no-browser", "--port=8888", "--ip=0.0.0.0"],
+            snapshot("uv run --no-project --with=jupyterlab --script\n"),
+            id="extra_jupyter_flags",
+        ),
+    ],
+)
+def test_run(  # noqa: PLR0913
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
+    init_args: list[str],
+    run_args: list[str],
+    expected: str,
 ) -> None:
     monkeypatch.chdir(tmp_path)
-    invoke(["init", "test.ipynb", "--python=3.8"])
-    result = invoke(["run", "--jupyter=notebook@6.4.0", "test.ipynb"])
-    assert result.exit_code == 0
-    assert result.stdout == snapshot(
-        "uv run --no-project --with=notebook==6.4.0,setuptools --script\n"
-    )
+    if init_args:
+        invoke(["init", *init_args, "test.ipynb"])
+    else:
+        (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
 
-
-def test_run_with_extra_jupyter_flags(
-    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
-) -> None:
-    monkeypatch.chdir(tmp_path)
-    invoke(["init", "test.ipynb"])
-    result = invoke(
-        [
-            "run",
-            "test.ipynb",
-            "--",
-            "--no-browser",
-            "--port=8888",
-            "--ip=0.0.0.0",
-        ]
-    )
+    result = invoke(["run", *run_args])
     assert result.exit_code == 0
-    assert result.stdout == snapshot("uv run --no-project --with=jupyterlab --script\n")
+    assert result.stdout == expected
 
 
 def test_run_uses_version_specifier(
@@ -285,11 +293,35 @@ print('Hello, world!')
     assert result.stdout == snapshot("uv run --no-project --with=jupyterlab --script\n")
 
 
+def test_run_script_always_reconverts(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    script_path = tmp_path / "script.py"
+    script_path.write_text("print('Hello, world!')\n")
+
+    result = invoke(["run", "script.py"])
+    assert result.exit_code == 0
+    assert "Converted script to notebook" in result.stdout
+
+    # the converted notebook may well be newer than an edited script
+    # (e.g., after a Jupyter autosave), but the script is the source of truth
+    script_path.write_text("print('Edited')\n")
+    notebook_path = tmp_path / "script.ipynb"
+    os.utime(notebook_path, (script_path.stat().st_mtime + 60,) * 2)
+
+    result = invoke(["run", "script.py"])
+    assert result.exit_code == 0
+    assert "Converted script to notebook" in result.stdout
+    assert "Edited" in notebook_path.read_text(encoding="utf-8")
+
+
+TEMPFILE_IPYNB_PATTERN = re.compile(r"`([^`\n]+\n?[^`\n]+/)([^/\n]+\.ipynb)`")
+
+
 def filter_tempfile_ipynb(output: str) -> str:
     """Replace the temporary directory in the output with <TEMPDIR> for snapshotting."""
-    pattern = r"`([^`\n]+\n?[^`\n]+/)([^/\n]+\.ipynb)`"
-    replacement = r"`<TEMPDIR>/\2`"
-    return re.sub(pattern, replacement, output)
+    return TEMPFILE_IPYNB_PATTERN.sub(r"`<TEMPDIR>/\2`", output)
 
 
 def test_add_creates_inline_meta(
@@ -608,17 +640,20 @@ def test_init_with_deps(
 
 
 def extract_meta_cell(notebook_path: pathlib.Path) -> str:
-    nb = jupytext.read(notebook_path)
-    return "".join(nb.cells[0].source)
+    # only the first cell's source is needed, so skip jupytext's format
+    # detection and validation
+    nb = json.loads(notebook_path.read_bytes())
+    return "".join(nb["cells"][0]["source"])
 
 
 def test_add_with_extras(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    invoke(["init", "test.ipynb"])
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     result = invoke(
         [
             "add",
@@ -643,14 +678,24 @@ def test_add_with_extras(
 """)
 
 
+@pytest.fixture(scope="session")
+def uv_lib_foo(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+    """A `uv init --lib foo` project, scaffolded once for the session."""
+    path = tmp_path_factory.mktemp("uv-lib")
+    uv(["init", "--lib", str(path / "foo")], check=True)
+    return path / "foo"
+
+
 def test_add_local_package(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    uv_lib_foo: pathlib.Path,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    uv(["init", "--lib", "foo"], check=True)
-    invoke(["init", "test.ipynb"])
+    shutil.copytree(uv_lib_foo, tmp_path / "foo")
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     result = invoke(["add", "test.ipynb", "./foo"])
 
     assert result.exit_code == 0
@@ -671,11 +716,13 @@ def test_add_local_package(
 def test_add_local_package_as_editable(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    uv_lib_foo: pathlib.Path,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    uv(["init", "--lib", "foo"], check=True)
-    invoke(["init", "test.ipynb"])
+    shutil.copytree(uv_lib_foo, tmp_path / "foo")
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     result = invoke(["add", "test.ipynb", "--editable", "./foo"])
 
     assert result.exit_code == 0
@@ -694,18 +741,12 @@ def test_add_local_package_as_editable(
 
 
 @pytest.mark.skip(reason="Currently too flaky to run in CI")
-def test_add_git_default(
-    tmp_path: pathlib.Path,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.chdir(tmp_path)
-
-    invoke(["init", "test.ipynb"])
-    result = invoke(["add", "test.ipynb", "git+https://github.com/encode/httpx"])
-
-    assert result.exit_code == 0
-    assert result.stdout == snapshot("Updated `test.ipynb`\n")
-    assert extract_meta_cell(tmp_path / "test.ipynb") == snapshot("""\
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        pytest.param(
+            [],
+            snapshot("""\
 # /// script
 # requires-python = ">=3.13"
 # dependencies = [
@@ -715,30 +756,12 @@ def test_add_git_default(
 # [tool.uv.sources]
 # httpx = { git = "https://github.com/encode/httpx" }
 # ///\
-""")
-
-
-@pytest.mark.skip(reason="Currently too flaky to run in CI")
-def test_add_git_tag(
-    tmp_path: pathlib.Path,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.chdir(tmp_path)
-
-    invoke(["init", "test.ipynb"])
-    result = invoke(
-        [
-            "add",
-            "test.ipynb",
-            "git+https://github.com/encode/httpx",
-            "--tag",
-            "0.19.0",
-        ]
-    )
-
-    assert result.exit_code == 0
-    assert result.stdout == snapshot("Updated `test.ipynb`\n")
-    assert extract_meta_cell(tmp_path / "test.ipynb") == snapshot("""\
+"""),
+            id="default",
+        ),
+        pytest.param(
+            ["--tag", "0.19.0"],
+            snapshot("""\
 # /// script
 # requires-python = ">=3.13"
 # dependencies = [
@@ -748,30 +771,12 @@ def test_add_git_tag(
 # [tool.uv.sources]
 # httpx = { git = "https://github.com/encode/httpx", tag = "0.19.0" }
 # ///\
-""")
-
-
-@pytest.mark.skip(reason="Currently too flaky to run in CI")
-def test_add_git_branch(
-    tmp_path: pathlib.Path,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.chdir(tmp_path)
-
-    invoke(["init", "test.ipynb"])
-    result = invoke(
-        [
-            "add",
-            "test.ipynb",
-            "git+https://github.com/encode/httpx",
-            "--branch",
-            "master",
-        ]
-    )
-
-    assert result.exit_code == 0
-    assert result.stdout == snapshot("Updated `test.ipynb`\n")
-    assert extract_meta_cell(tmp_path / "test.ipynb") == snapshot("""\
+"""),
+            id="tag",
+        ),
+        pytest.param(
+            ["--branch", "master"],
+            snapshot("""\
 # /// script
 # requires-python = ">=3.13"
 # dependencies = [
@@ -781,30 +786,12 @@ def test_add_git_branch(
 # [tool.uv.sources]
 # httpx = { git = "https://github.com/encode/httpx", branch = "master" }
 # ///\
-""")
-
-
-@pytest.mark.skip(reason="Currently too flaky to run in CI")
-def test_add_git_rev(
-    tmp_path: pathlib.Path,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.chdir(tmp_path)
-
-    invoke(["init", "test.ipynb"])
-    result = invoke(
-        [
-            "add",
-            "test.ipynb",
-            "git+https://github.com/encode/httpx",
-            "--rev",
-            "326b9431c761e1ef1e00b9f760d1f654c8db48c6",
-        ]
-    )
-
-    assert result.exit_code == 0
-    assert result.stdout == snapshot("Updated `test.ipynb`\n")
-    assert extract_meta_cell(tmp_path / "test.ipynb") == snapshot("""\
+"""),
+            id="branch",
+        ),
+        pytest.param(
+            ["--rev", "326b9431c761e1ef1e00b9f760d1f654c8db48c6"],
+            snapshot("""\
 # /// script
 # requires-python = ">=3.13"
 # dependencies = [
@@ -814,29 +801,44 @@ def test_add_git_rev(
 # [tool.uv.sources]
 # httpx = { git = "https://github.com/encode/httpx", rev = "326b9431c761e1ef1e00b9f760d1f654c8db48c6" }
 # ///\
-""")
+"""),
+            id="rev",
+        ),
+    ],
+)
+def test_add_git(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
+    args: list[str],
+    expected: str,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
+    result = invoke(["add", "test.ipynb", "git+https://github.com/encode/httpx", *args])
+
+    assert result.exit_code == 0
+    assert result.stdout == snapshot("Updated `test.ipynb`\n")
+    assert extract_meta_cell(tmp_path / "test.ipynb") == expected
 
 
 @pytest.mark.skipif(sys.version_info < (3, 9), reason="Requires Python 3.9 or higher")
 def test_stamp(
+    tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
-    # we need to run these tests in this folder because it uses the git history
-
-    with TemporaryDirectoryIgnoreErrors(dir=SELF_DIR) as tmpdir:
-        tmp_path = pathlib.Path(tmpdir)
-        monkeypatch.chdir(tmp_path)
-
-        invoke(["init", "test.ipynb"])
-        result = invoke(
-            ["stamp", "test.ipynb", "--timestamp", "2020-01-03 00:00:00-02:00"]
-        )
-
-        assert result.exit_code == 0
-        assert result.stdout == snapshot(
-            "Stamped `test.ipynb` with 2020-01-03T00:00:00-02:00\n"
-        )
-        assert extract_meta_cell(tmp_path / "test.ipynb") == snapshot("""\
+    monkeypatch.chdir(tmp_path)
+
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
+    result = invoke(["stamp", "test.ipynb", "--timestamp", "2020-01-03 00:00:00-02:00"])
+
+    assert result.exit_code == 0
+    assert result.stdout == snapshot(
+        "Stamped `test.ipynb` with 2020-01-03T00:00:00-02:00\n"
+    )
+    assert extract_meta_cell(tmp_path / "test.ipynb") == snapshot("""\
 # /// script
 # requires-python = ">=3.13"
 # dependencies = []
@@ -849,16 +851,13 @@ def test_stamp(
 
 @pytest.mark.skipif(sys.version_info < (3, 9), reason="Requires Python 3.9 or higher")
 def test_stamp_script(
+    tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    # we need to run these tests in this folder because it uses the git history
-
-    with TemporaryDirectoryIgnoreErrors(dir=SELF_DIR) as tmpdir:
-        tmp_path = pathlib.Path(tmpdir)
-        monkeypatch.chdir(tmp_path)
+    monkeypatch.chdir(tmp_path)
 
-        with (tmp_path / "foo.py").open("w", encoding="utf-8") as f:
-            f.write("""# /// script
+    with (tmp_path / "foo.py").open("w", encoding="utf-8") as f:
+        f.write("""# /// script
 # requires-python = ">=3.13"
 # dependencies = []
 # ///
@@ -871,13 +870,13 @@ def main() -> None:
 if __name__ == "__main__":
     main()
 """)
-        result = invoke(["stamp", "foo.py", "--date", "2006-01-02"])
+    result = invoke(["stamp", "foo.py", "--date", "2006-01-02"])
 
-        assert result.exit_code == 0
-        assert result.stdout == snapshot(
-            "Stamped `foo.py` with 2006-01-03T00:00:00-05:00\n"
-        )
-        assert (tmp_path / "foo.py").read_text(encoding="utf-8") == snapshot("""\
+    assert result.exit_code == 0
+    assert result.stdout == snapshot(
+        "Stamped `foo.py` with 2006-01-03T00:00:00-05:00\n"
+    )
+    assert (tmp_path / "foo.py").read_text(encoding="utf-8") == snapshot("""\
 # /// script
 # requires-python = ">=3.13"
 # dependencies = []
@@ -898,16 +897,13 @@ if __name__ == "__main__":
 
 @pytest.mark.skipif(sys.version_info < (3, 9), reason="Requires Python 3.9 or higher")
 def test_stamp_clear(
+    tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    # we need to run these tests in this folder because it uses the git history
-
-    with TemporaryDirectoryIgnoreErrors(dir=SELF_DIR) as tmpdir:
-        tmp_path = pathlib.Path(tmpdir)
-        monkeypatch.chdir(tmp_path)
+    monkeypatch.chdir(tmp_path)
 
-        with (tmp_path / "foo.py").open("w", encoding="utf-8") as f:
-            f.write("""# /// script
+    with (tmp_path / "foo.py").open("w", encoding="utf-8") as f:
+        f.write("""# /// script
 # requires-python = ">=3.13"
 # dependencies = []
 #
@@ -916,11 +912,11 @@ def test_stamp_clear(
 # ///
 """)
 
-        result = invoke(["stamp", "foo.py", "--clear"])
+    result = invoke(["stamp", "foo.py", "--clear"])
 
-        assert result.exit_code == 0
-        assert result.stdout == snapshot("Removed blah from `foo.py`\n")
-        assert (tmp_path / "foo.py").read_text(encoding="utf-8") == snapshot("""\
+    assert result.exit_code == 0
+    assert result.stdout == snapshot("Removed blah from `foo.py`\n")
+    assert (tmp_path / "foo.py").read_text(encoding="utf-8") == snapshot("""\
 # /// script
 # requires-python = ">=3.13"
 # dependencies = []
@@ -931,10 +927,11 @@ def test_stamp_clear(
 def test_add_notebook_pinned(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    invoke(["init", "test.ipynb"])
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     result = invoke(["add", "test.ipynb", "anywidget", "--pin"])
     assert result.exit_code == 0
     assert result.stdout == snapshot("Updated `test.ipynb`\n")
@@ -981,10 +978,11 @@ print("Hello from foo.py!")
 def test_remove(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    invoke(["init", "test.ipynb"])
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     result = invoke(
         ["add", "test.ipynb", "anywidget", "numpy==1.21.0", "polars==1.0.0"]
     )
@@ -1017,10 +1015,11 @@ def test_remove(
 def test_lock(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    invoke(["init", "test.ipynb"])
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     invoke(["add", "test.ipynb", "polars"])
     result = invoke(["lock", "test.ipynb"])
     assert result.exit_code == 0
@@ -1064,10 +1063,11 @@ wheels = [
 def test_add_updates_lock(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    invoke(["init", "test.ipynb"])
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     result = invoke(["lock", "test.ipynb"])
     assert result.exit_code == 0
     assert result.stdout == snapshot("Locked `test.ipynb`\n")
@@ -1115,10 +1115,11 @@ wheels = [
 def test_remove_updates_lock(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    invoke(["init", "test.ipynb"])
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     invoke(["add", "test.ipynb", "polars"])
     result = invoke(["lock", "test.ipynb"])
     assert result.exit_code == 0
@@ -1161,10 +1162,11 @@ exclude-newer = "2023-02-01T02:00:00Z"
 def test_tree(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    invoke(["init", "test.ipynb"])
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     invoke(["add", "test.ipynb", "rich"])
     result = invoke(["tree", "test.ipynb"])
     assert result.exit_code == 0
@@ -1179,10 +1181,11 @@ rich v13.3.1
 def test_clear_lock(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    invoke(["init", "test.ipynb"])
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     invoke(["add", "test.ipynb", "attrs"])
     invoke(["lock", "test.ipynb"])
     assert jupytext.read(tmp_path / "test.ipynb").metadata.get("uv.lock") == snapshot("""\
@@ -1221,10 +1224,11 @@ def sanitize_uv_export_command(output: str) -> str:
 def test_export(
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    invoke(["init", "test.ipynb"])
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     invoke(["add", "test.ipynb", "attrs"])
     result = invoke(["export", "test.ipynb"])
     assert result.exit_code == 0
@@ -1242,10 +1246,11 @@ def test_commands_update_lock(
     command: str,
     tmp_path: pathlib.Path,
     monkeypatch: pytest.MonkeyPatch,
+    init_notebook_bytes: bytes,
 ) -> None:
     monkeypatch.chdir(tmp_path)
 
-    invoke(["init", "test.ipynb"])
+    (tmp_path / "test.ipynb").write_bytes(init_notebook_bytes)
     invoke(["lock", "test.ipynb"])
     invoke(["add", "test.ipynb", "attrs"])
     invoke([command, "test.ipynb"])
@@ -1284,3 +1289,198 @@ requires-python = ">=3.8"
 [options]
 exclude-newer = "2023-02-01T02:00:00Z"
 """)
+
+
+def test_cat(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    cell = new_code_cell("print('Hello, world!')", execution_count=1)
+    cell.outputs = [{"output_type": "stream", "name": "stdout", "text": "Hello\n"}]
+    write_ipynb(new_notebook(cells=[cell]), tmp_path / "test.ipynb")
+
+    result = invoke(["cat", "test.ipynb"])
+    assert result.exit_code == 0
+    assert result.stdout == snapshot("""\
+```python
+print('Hello, world!')
+```
+""")
+
+    result = invoke(["cat", "--script", "test.ipynb"])
+    assert result.exit_code == 0
+    assert result.stdout == snapshot("""\
+# %%
+print('Hello, world!')
+""")
+
+
+def test_cat_nbformat_v3(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    cell = v3.new_code_cell(
+        input="print('Hello, world!')",
+        outputs=[v3.new_output("stream", output_text="Hello\n")],
+    )
+    nb = v3.new_notebook(worksheets=[v3.new_worksheet(cells=[cell])])
+    (tmp_path / "test.ipynb").write_text(v3.writes_json(nb), encoding="utf-8")
+
+    result = invoke(["cat", "--script", "test.ipynb"])
+    assert result.exit_code == 0
+    assert result.stdout == snapshot("""\
+# %%
+print('Hello, world!')
+""")
+
+
+def test_to_notebook_nbformat_v3(tmp_path: pathlib.Path) -> None:
+    cell = v3.new_code_cell(
+        input="""# /// script
+# dependencies = ["numpy"]
+# ///""",
+    )
+    nb = v3.new_notebook(worksheets=[v3.new_worksheet(cells=[cell])])
+    (tmp_path / "test.ipynb").write_text(v3.writes_json(nb), encoding="utf-8")
+
+    meta, _ = to_notebook(tmp_path / "test.ipynb")
+    assert meta == snapshot("""\
+# /// script
+# dependencies = ["numpy"]
+# ///\
+""")
+
+
+def test_write_ipynb_matches_jupytext(tmp_path: pathlib.Path) -> None:
+    # legacy jupytext keys are upgraded, like `jupytext.writes` does
+    nb = new_notebook(
+        cells=[new_code_cell("x = 1")],
+        metadata={
+            "jupytext_formats": "ipynb,py:percent",
+            "main_language": "python",
+            "jupytext": {"text_representation": {"format_version": "1.3"}},
+        },
+    )
+    write_ipynb(nb, tmp_path / "test.ipynb")
+    assert (tmp_path / "test.ipynb").read_text(encoding="utf-8") == jupytext.writes(
+        nb, fmt="ipynb"
+    )
+
+
+def test_clear_directory(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    notebooks = tmp_path / "notebooks"
+    notebooks.mkdir()
+    for name in ["a.ipynb", "b.ipynb"]:
+        cell = new_code_cell("print('Hello, world!')", execution_count=1)
+        cell.outputs = [{"output_type": "stream", "name": "stdout", "text": "Hi\n"}]
+        write_ipynb(new_notebook(cells=[cell]), notebooks / name)
+    (notebooks / "script.py").write_text("print('Hello, world!')\n")
+
+    result = invoke(["clear", "notebooks"])
+    assert result.exit_code == 0
+    assert result.stdout.endswith("Cleared output from 2 notebooks\n")
+
+    result = invoke(["clear", "--check", "notebooks"])
+    assert result.exit_code == 0
+    assert result.stdout == snapshot("All notebooks are cleared\n")
+
+    # already cleared notebooks are not rewritten
+    mtime = (notebooks / "a.ipynb").stat().st_mtime_ns
+    result = invoke(["clear", "notebooks/a.ipynb"])
+    assert result.exit_code == 0
+    assert result.stdout == snapshot("Cleared output from `notebooks/a.ipynb`\n")
+    assert (notebooks / "a.ipynb").stat().st_mtime_ns == mtime
+
+    # relative paths are displayed normalized
+    result = invoke(["clear", "notebooks/../notebooks/./a.ipynb"])
+    assert result.exit_code == 0
+    assert result.stdout == snapshot("Cleared output from `notebooks/a.ipynb`\n")
+
+
+@pytest.mark.parametrize(
+    ("editor", "expected"),
+    [
+        ("code", True),
+        ("code-insiders", True),
+        ("code-oss", True),
+        ("/usr/local/bin/codium", True),
+        ("vscodium", True),
+        ("vim", False),
+        ("/home/me/code/bin/vim", False),
+    ],
+)
+def test_edit_needs_wait_flag(editor: str, *, expected: bool) -> None:
+    assert needs_wait_flag(editor) is expected
+
+
+def scripted_editor(path: pathlib.Path, body: str) -> str:
+    """Write an executable "editor" that runs `body` on the file it is given."""
+    path.write_text(
+        f"#!{sys.executable}\nimport pathlib, sys\nfile = pathlib.Path(sys.argv[1])\n{body}",
+        encoding="utf-8",
+    )
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Uses a shebang script as editor")
+def test_edit(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    cell = new_code_cell("print('Hello')", execution_count=1, id="hello")
+    cell.outputs = [{"output_type": "stream", "name": "stdout", "text": "Hello\n"}]
+    nb = new_notebook(cells=[new_markdown_cell("# Title", id="title"), cell])
+    write_ipynb(nb, tmp_path / "test.ipynb")
+
+    # closing the editor without changes leaves the notebook untouched
+    mtime = (tmp_path / "test.ipynb").stat().st_mtime_ns
+    noop = scripted_editor(tmp_path / "noop.py", "")
+    result = invoke(["edit", "--editor", noop, "test.ipynb"])
+    assert result.exit_code == 0
+    assert (tmp_path / "test.ipynb").stat().st_mtime_ns == mtime
+
+    # saved with a byte order mark, as some (Windows) editors do
+    editor = scripted_editor(
+        tmp_path / "editor.py",
+        """\
+text = file.read_text(encoding="utf-8").replace("Hello", "Hello, world!")
+file.write_text(text, encoding="utf-8-sig")
+""",
+    )
+    result = invoke(["edit", "--editor", editor, "test.ipynb"])
+    assert result.exit_code == 0
+    assert (tmp_path / "test.ipynb").read_text(encoding="utf-8") == snapshot("""\
+{
+ "cells": [
+  {
+   "cell_type": "markdown",
+   "id": "title",
+   "metadata": {},
+   "source": [
+    "# Title"
+   ]
+  },
+  {
+   "cell_type": "code",
+   "execution_count": 1,
+   "id": "hello",
+   "metadata": {},
+   "outputs": [
+    {
+     "name": "stdout",
+     "output_type": "stream",
+     "text": [
+      "Hello\\n"
+     ]
+    }
+   ],
+   "source": [
+    "print('Hello, world!')"
+   ]
+  }
+ ],
+ "metadata": {},
+ "nbformat": 4,
+ "nbformat_minor": 5
+}\
+""")